@@ -1,6 +1,8 @@
 import yfinance as yf
 import pandas as pd
 import os
+import time
+from collections import OrderedDict
 
 
 def _clean_index(df: pd.DataFrame) -> pd.DataFrame:
@@ -9,62 +11,153 @@ def _clean_index(df: pd.DataFrame) -> pd.DataFrame:
         df.index = pd.to_datetime(df.index)
     if df.index.tz is not None:
         df = df.tz_localize(None)
-    return df.sort_index().loc[~df.index.duplicated(keep="last")]
+    # stable sort keeps later rows after earlier ones on equal dates, so keep="last" prefers the newest
+    df = df.sort_index(kind="stable")
+    return df.loc[~df.index.duplicated(keep="last")]
+
+# In-process LRU of combined frames keyed on (tickers, start, end, cache_dir)
+_PRICE_CACHE_SIZE = 32
+_price_cache: OrderedDict = OrderedDict()
+
+def _cache_is_fresh(cache_file: str, cache_ttl: float | None) -> bool:
+    if cache_ttl is None:
+        return True
+    return (time.time() - os.path.getmtime(cache_file)) <= cache_ttl
+
+def _read_cache(cache_file: str) -> tuple[pd.DataFrame, list]:
+    # Parquet keeps the cleaned DatetimeIndex and dtypes, so no re-parsing is needed
+    cached = pd.read_parquet(cache_file)
+    ranges = cached.attrs.pop("fetched_ranges", [])
+    return cached, [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in ranges]
+
+def _write_cache(df: pd.DataFrame, cache_file: str, ranges: list) -> None:
+    # The [start, end) ranges actually downloaded travel with the data in the Parquet metadata
+    # (pandas >= 2.1 round-trips attrs, hence the pin in requirements.txt)
+    out = df.copy(deep=False)
+    out.attrs = {"fetched_ranges": [[s.isoformat(), e.isoformat()] for s, e in ranges]}
+    out.to_parquet(cache_file)
+
+def _add_range(ranges: list, start: pd.Timestamp, end: pd.Timestamp) -> list:
+    merged = []
+    for s, e in sorted(ranges + [(start, end)]):
+        if merged and s <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+        else:
+            merged.append((s, e))
+    return merged
 
-"""
-This function downloads price data for a list of tickers from Yahoo Finance and caches it in a local directory.
-
-Parameters:
-tickers: list[str] - The list of tickers to download data for.
-start_date: str - The start date for the data.
-end_date: str - The end date for the data.
-cache_dir: str - The directory to cache the data in.
-"""
-def get_price_data(tickers: list[str], start_date: str, end_date: str, cache_dir: str = "data/") -> pd.DataFrame:
-    data = yf.download(tickers, start=start_date, end=end_date, auto_adjust=False, group_by="ticker", threads=False)
+def _cache_covers(ranges: list, start: pd.Timestamp, end: pd.Timestamp) -> bool:
+    # Ranges are merged on write, so a covered request sits inside a single one;
+    # the data's own first/last dates can't tell a hole between two fetches apart
+    return any(s <= start and end <= e for s, e in ranges)
 
+def _load_price_data(tickers: tuple[str, ...], start_date: str, end_date: str, cache_dir: str, cache_ttl: float | None) -> tuple[pd.DataFrame, bool]:
     os.makedirs(cache_dir, exist_ok=True)
 
-    all_data = []
-
-    for ticker in tickers:    
-        if isinstance(data.columns, pd.MultiIndex):
-            if ticker not in data.columns.get_level_values(0):
-                raise ValueError(f"Ticker {ticker} not found in downloaded data.")
-            ticker_data = data[ticker]
-        else:
-            # single-ticker request - raw already has columns like 'Open','Close',...
-            ticker_data = data.copy()  
-  
-        ticker_data = _clean_index(ticker_data)
+    start = pd.to_datetime(start_date)
+    end = pd.to_datetime(end_date)
 
+    cached_data = {}
+    cached_ranges = {}
+    to_download = []
 
-        cache_file = f"{cache_dir}/{ticker}.csv"
+    for ticker in tickers:
+        cache_file = f"{cache_dir}/{ticker}.parquet"
         if os.path.exists(cache_file):
-            cached = pd.read_csv(cache_file, index_col=0, parse_dates=True)
-            cached = _clean_index(cached)
-            # Merge & prefer latest from freshly downloaded
-            merged = pd.concat([cached, ticker_data], axis=0)
-            merged = _clean_index(merged)
-            # Trim to requested range if you want strict range:
-            merged = merged.loc[(merged.index >= pd.to_datetime(start_date)) & (merged.index <= pd.to_datetime(end_date))]
-            merged.to_csv(cache_file)
-            ticker_data = merged
-        else:
-            ticker_data.to_csv(cache_file)
-        
-        ticker_data.columns = pd.MultiIndex.from_product([[ticker], ticker_data.columns])
-        all_data.append(ticker_data)
-
-    combined_df = pd.concat(all_data, axis=1, join="outer")
-
-    return combined_df
-        
+            cached_data[ticker], cached_ranges[ticker] = _read_cache(cache_file)
+            if _cache_is_fresh(cache_file, cache_ttl) and _cache_covers(cached_ranges[ticker], start, end):
+                continue
+        to_download.append(ticker)
 
+    # One batch request for every ticker the cache cannot serve
+    if to_download:
+        data = yf.download(to_download, start=start_date, end=end_date, auto_adjust=False, group_by="ticker", threads=False)
 
+    all_data = []
+    # The result is complete only if every ticker's fetched ranges span the request
+    fetched_end = min(end, pd.Timestamp.today().normalize())
+    complete = True
+
+    for ticker in tickers:
+        cache_file = f"{cache_dir}/{ticker}.parquet"
+        if ticker in to_download:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(0):
+                    raise ValueError(f"Ticker {ticker} not found in downloaded data.")
+                ticker_data = data[ticker]
+            else:
+                # single-ticker request - raw already has columns like 'Open','Close',...
+                ticker_data = data.copy()
+
+            # A ticker that failed inside a batch comes back as all-NaN rows rather than an empty frame
+            downloaded = _clean_index(ticker_data).dropna(how="all")
+            ticker_data = downloaded
+
+            # Record the range as fetched only if data came back (a failed download returns
+            # an empty frame), and never past today, whose bar may still be incomplete
+            ranges = cached_ranges.get(ticker, [])
+            if not ticker_data.empty and fetched_end > start:
+                ranges = _add_range(ranges, start, fetched_end)
+
+            unchanged = False
+            if ticker in cached_data:
+                # Merge & prefer latest from freshly downloaded
+                merged = pd.concat([cached_data[ticker], ticker_data], axis=0)
+                ticker_data = _clean_index(merged)
+                unchanged = ticker_data.equals(cached_data[ticker]) and ranges == cached_ranges[ticker]
+
+            if unchanged:
+                # Nothing new arrived: skip the rewrite, and restart the cache TTL only if the
+                # download actually succeeded, so a failed refresh doesn't pass stale data as fresh
+                if not downloaded.empty:
+                    os.utime(cache_file)
+            else:
+                _write_cache(ticker_data, cache_file, ranges)
+        else:
+            ticker_data = cached_data[ticker]
+            ranges = cached_ranges[ticker]
 
+        complete = complete and _cache_covers(ranges, start, fetched_end)
 
+        # The cache keeps everything seen so far; return only the requested [start, end) range,
+        # end-exclusive like yfinance so the result doesn't depend on what was cached before
+        all_data.append(ticker_data.loc[(ticker_data.index >= start) & (ticker_data.index < end)])
 
+    # keys= builds the (ticker, field) column MultiIndex in one go
+    combined_df = pd.concat(all_data, axis=1, join="outer", keys=tickers, names=["ticker", "field"])
 
+    return combined_df, complete
 
+"""
+This function returns price data for a list of tickers, reading from a local cache and
+downloading from Yahoo Finance only the tickers whose cache is missing, stale or does not
+cover the requested range.
 
+Parameters:
+tickers: list[str] - The list of tickers to download data for.
+start_date: str - The start date for the data.
+end_date: str - The end date for the data (exclusive, as in yfinance).
+cache_dir: str - The directory to cache the data in.
+cache_ttl: float | None - Maximum age of a cache file in seconds before it is refreshed (None = never expires).
+"""
+def get_price_data(tickers: list[str], start_date: str, end_date: str, cache_dir: str = "data/", cache_ttl: float | None = None) -> pd.DataFrame:
+    tickers = tuple(tickers)
+
+    # cache_ttl asks for the disk cache to be re-checked, which a copy held in memory would skip
+    if cache_ttl is not None:
+        return _load_price_data(tickers, start_date, end_date, cache_dir, cache_ttl)[0]
+
+    # Repeated requests in the same process are served from memory; copy so callers can't mutate the cached frame
+    key = (tickers, start_date, end_date, cache_dir)
+    if key in _price_cache:
+        _price_cache.move_to_end(key)
+        return _price_cache[key].copy()
+
+    combined_df, complete = _load_price_data(tickers, start_date, end_date, cache_dir, cache_ttl)
+    # yfinance returns an empty frame instead of raising on failure; don't pin a partial result for the process
+    if complete:
+        _price_cache[key] = combined_df
+        if len(_price_cache) > _PRICE_CACHE_SIZE:
+            _price_cache.popitem(last=False)
+
+    return combined_df.copy()
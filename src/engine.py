@@ -1,13 +1,18 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
+from ._njit import NUMBA_AVAILABLE
+from .engine_kernel import OUTPUT_COLUMNS, _bt_kernel, _bt_vectorized
 
-def run_backtest(close, signal, open_ = None, initial_cash = 100000.0, fee_bps = 1.0, slippage_bps = 0.0, align_signal = False):
-    signal = signal.copy()
+# Without numba the kernel would run as a plain Python loop; use the NumPy path instead
+_backtest_impl = _bt_kernel if NUMBA_AVAILABLE else _bt_vectorized
 
+def run_backtest(close, signal, open_ = None, initial_cash = 100000.0, fee_bps = 1.0, slippage_bps = 0.0, align_signal = False):
     if align_signal:
-        signal = signal.shift(1).fillna(0).astype(int)
+        signal = signal.shift(1).fillna(0).astype(np.int8)
     else:
-        signal = signal.astype(int)
+        signal = signal.astype(np.int8)
     
     trade_px_src = open_ if open_ is not None else close
     exec_px = trade_px_src.shift(-1)   # next bar
@@ -15,76 +20,49 @@ def run_backtest(close, signal, open_ = None, initial_cash = 100000.0, fee_bps =
     slip_mult_sell = 1.0 - slippage_bps/10_000.0
 
     idx = close.index
-    position   = np.zeros(len(idx), dtype=int)
-    shares_arr = np.zeros(len(idx), dtype=float)
-    trade_arr  = np.zeros(len(idx), dtype=float)
-    exec_arr   = np.full(len(idx), np.nan, dtype=float)
-    cash_arr   = np.zeros(len(idx), dtype=float)
-    hold_arr   = np.zeros(len(idx), dtype=float)
-    equity_arr = np.zeros(len(idx), dtype=float)
-    fees_arr   = np.zeros(len(idx), dtype=float)
 
-    cash = float(initial_cash)
-    shares = 0.0
-    last_position = 0
+    # pandas stays at the boundary: convert once to contiguous float64/int8 buffers
+    # (nullable NA -> NaN) so the loop indexes raw memory and numba compiles one signature
+    close_v = np.ascontiguousarray(close.to_numpy(dtype=np.float64, na_value=np.nan))
+    exec_v = np.ascontiguousarray(exec_px.to_numpy(dtype=np.float64, na_value=np.nan))
+    sig_v = np.ascontiguousarray(signal.to_numpy())
 
-    for i, trade in enumerate(idx):
-        current_position = int(signal.iloc[i])
-        px_mtm = close.iloc[i]
-        px_exec = exec_px.iloc[i]
+    position, values = _backtest_impl(
+        close_v,
+        exec_v,
+        sig_v,
+        float(initial_cash),
+        fee_bps/10_000.0,
+        slip_mult_buy,
+        slip_mult_sell,
+    )
 
-        trade_shares = 0.0
-        fees_today = 0.0
+    # one (n, 7) float block, wrapped without copying
+    output = pd.DataFrame(values, columns=OUTPUT_COLUMNS, index=idx, copy=False)
+    output.insert(0, "position", position)
 
-        # Enter or exit only if execution price exists (not last bar)
-        if not np.isnan(px_exec) and current_position != last_position:
-            if current_position == 1 and last_position == 0:
-                # BUY max shares we can afford, accounting for fees and slippage
-                trade_price = px_exec * slip_mult_buy
-                # approximate shares we can buy; fees scale with notional
-                # notional = shares * trade_price; fee = fee_bps/1e4 * notional
-                # effective cost per share = trade_price * (1 + fee_bps/1e4)
-                effective_cost_per_share = trade_price * (1 + fee_bps/10_000.0)
-                trade_shares = cash / effective_cost_per_share
-                notional = trade_shares * trade_price
-                fees_today = (fee_bps/10_000.0) * notional
-                cash -= (notional + fees_today)
-                shares += trade_shares
-                exec_arr[i] = trade_price
-            elif current_position == 0 and last_position == 1:
-                trade_price = px_exec * slip_mult_sell
-                trade_shares = -shares
-                notional = (-trade_shares) * trade_price  # positive notional
-                fees_today = (fee_bps/10_000.0) * notional
-                cash += (notional - fees_today)
-                shares = 0.0
-                exec_arr[i] = trade_price
+    return output
 
-        # mark-to-market
-        holdings = shares * px_mtm
-        equity = cash + holdings
+def run_backtests(inputs, max_workers = None, chunk_size = 1, **kwargs):
+    """
+    Run run_backtest for many tickers concurrently.
+    inputs maps ticker -> (close, signal) or (close, signal, open_); kwargs are passed
+    to every run_backtest call. Returns a dict of ticker -> backtest DataFrame.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
 
-        position[i] = current_position
-        shares_arr[i] = shares
-        trade_arr[i] = trade_shares
-        cash_arr[i] = cash
-        hold_arr[i] = holdings
-        equity_arr[i] = equity
-        fees_arr[i] = fees_today
-        last_position = current_position
+    items = list(inputs.items())
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
 
-    output = pd.DataFrame({
-        "position": position,
-        "shares": shares_arr,
-        "trade_shares": trade_arr,
-        "exec_px": exec_arr,
-        "cash": cash_arr,
-        "holdings": hold_arr,
-        "equity": equity_arr,
-        "fees": fees_arr
-    },
-    index=idx
-    )
+    def run_chunk(chunk):
+        return [(ticker, run_backtest(*args, **kwargs)) for ticker, args in chunk]
 
-    return output
+    # The numba kernel releases the GIL and the NumPy fallback spends its time in C,
+    # so threads run in parallel without pickling the inputs to worker processes
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        for done in pool.map(run_chunk, chunks):
+            results.update(done)
 
+    return results
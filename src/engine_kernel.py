@@ -0,0 +1,132 @@
+import numpy as np
+from ._njit import njit
+
+# Column layout of the float output matrix; position is returned separately as int8
+COL_SHARES, COL_TRADE, COL_EXEC, COL_CASH, COL_HOLD, COL_EQUITY, COL_FEES = range(7)
+OUTPUT_COLUMNS = ["shares", "trade_shares", "exec_px", "cash", "holdings", "equity", "fees"]
+
+# fastmath without "nnan": the kernel relies on np.isnan to skip the last bar.
+# nogil lets run_backtests run several kernels on threads at once.
+@njit(cache=True, nogil=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
+def _bt_kernel(close, exec_px, signal, init_cash, fee, slip_buy, slip_sell):
+    n = len(close)
+    position = np.empty(n, dtype=np.int8)
+    out = np.empty((n, 7), dtype=np.float64)
+
+    cash = init_cash
+    shares = 0.0
+    last_position = 0
+
+    # loop invariants: all-in cost per unit of exec price, net proceeds per unit sold
+    buy_cost_mult = slip_buy * (1.0 + fee)
+    sell_net_mult = 1.0 - fee
+
+    for i in range(n):
+        current_position = signal[i]
+        px_exec = exec_px[i]
+
+        trade_shares = 0.0
+        fees_today = 0.0
+        trade_price = np.nan
+
+        # Enter or exit only if execution price exists (not last bar)
+        if not np.isnan(px_exec) and current_position != last_position:
+            if current_position == 1 and last_position == 0:
+                # BUY max shares we can afford: all cash goes to notional + fee
+                trade_price = px_exec * slip_buy
+                trade_shares = cash / (px_exec * buy_cost_mult)
+                fees_today = fee * trade_shares * trade_price
+                cash = 0.0
+                shares += trade_shares
+            elif current_position == 0 and last_position == 1:
+                trade_price = px_exec * slip_sell
+                trade_shares = -shares
+                notional = shares * trade_price  # positive notional
+                fees_today = fee * notional
+                cash += notional * sell_net_mult
+                shares = 0.0
+
+        # mark-to-market
+        holdings = shares * close[i]
+
+        position[i] = current_position
+        out[i, COL_SHARES] = shares
+        out[i, COL_TRADE] = trade_shares
+        out[i, COL_EXEC] = trade_price
+        out[i, COL_CASH] = cash
+        out[i, COL_HOLD] = holdings
+        out[i, COL_EQUITY] = cash + holdings
+        out[i, COL_FEES] = fees_today
+        last_position = current_position
+
+    return position, out
+
+
+def _bt_vectorized(close, exec_px, signal, init_cash, fee, slip_buy, slip_sell):
+    """
+    Closed-form equivalent of _bt_kernel for the long/flat, all-in/all-out engine.
+    Every round trip scales cash by sell_net / buy_cost, so the whole run is a
+    cumulative product over the trades, forward-filled between them.
+    """
+    n = len(close)
+    bars = np.arange(n)
+    position = signal.astype(np.int8)
+    last = np.r_[0, position[:-1]]
+    valid = ~np.isnan(exec_px)
+
+    buy_evt = valid & (position == 1) & (last == 0)
+    sell_evt = valid & (position == 0) & (last == 1)
+
+    # Holding state after each bar: was the most recent executable event a buy?
+    evt = np.where(buy_evt, 1, np.where(sell_evt, -1, 0))
+    last_evt = np.maximum.accumulate(np.where(evt != 0, bars, -1))
+    held = (last_evt >= 0) & (evt[np.maximum(last_evt, 0)] == 1)
+    held_before = np.r_[False, held[:-1]]
+
+    # Only events that flip the holding state move cash/shares; the rest trade 0
+    buys = np.flatnonzero(buy_evt & ~held_before)
+    sells = np.flatnonzero(sell_evt & held_before)
+
+    buy_px = exec_px * slip_buy
+    sell_px = exec_px * slip_sell
+    buy_cost = buy_px[buys] * (1.0 + fee)
+    sell_net = sell_px[sells] * (1.0 - fee)
+
+    growth = sell_net / buy_cost[:len(sells)]
+    cash_at_buy = init_cash * np.r_[1.0, np.cumprod(growth)][:len(buys)]
+    bought = cash_at_buy / buy_cost
+    cash_at_sell = cash_at_buy[:len(sells)] * growth
+
+    out = np.empty((n, 7), dtype=np.float64)
+
+    trade_arr = out[:, COL_TRADE]
+    trade_arr[:] = 0.0
+    trade_arr[buys] = bought
+    trade_arr[sells] = -bought[:len(sells)]
+
+    fees_arr = out[:, COL_FEES]
+    fees_arr[:] = 0.0
+    fees_arr[buys] = fee * bought * buy_px[buys]
+    fees_arr[sells] = fee * bought[:len(sells)] * sell_px[sells]
+
+    exec_arr = out[:, COL_EXEC]
+    exec_arr[:] = np.nan
+    exec_arr[buy_evt] = buy_px[buy_evt]
+    exec_arr[sell_evt] = sell_px[sell_evt]
+
+    # Forward-fill post-trade cash/shares from the most recent real trade
+    shares_lvl = np.zeros(n, dtype=np.float64)
+    shares_lvl[buys] = bought
+    cash_lvl = np.zeros(n, dtype=np.float64)
+    cash_lvl[sells] = cash_at_sell
+    traded = np.zeros(n, dtype=bool)
+    traded[buys] = True
+    traded[sells] = True
+    last_trade = np.maximum.accumulate(np.where(traded, bars, -1))
+    src = np.maximum(last_trade, 0)
+    out[:, COL_SHARES] = np.where(last_trade >= 0, shares_lvl[src], 0.0)
+    out[:, COL_CASH] = np.where(last_trade >= 0, cash_lvl[src], init_cash)
+    out[:, COL_HOLD] = out[:, COL_SHARES] * close
+    out[:, COL_EQUITY] = out[:, COL_CASH] + out[:, COL_HOLD]
+
+    return position, out
@@ -1,11 +1,24 @@
 import pandas as pd
 import numpy as np
+from ._njit import NUMBA_AVAILABLE
+from .indicators_kernel import _rolling_mean, _rolling_zscore
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
 
 def simple_moving_average(series, window) -> pd.Series:
     if window < 1:
         raise ValueError("Window must be at least 1")
     
     s = pd.Series(series, dtype="float64")
+
+    if NUMBA_AVAILABLE:
+        return pd.Series(_rolling_mean(s.to_numpy(), window), index=s.index)
+    # bottleneck rejects windows longer than the series; pandas handles that case
+    if bn is not None and window <= len(s):
+        return pd.Series(bn.move_mean(s.to_numpy(), window, min_count=window), index=s.index)
     
     return s.rolling(window=window, min_periods=window).mean()
 
@@ -18,6 +31,24 @@ def zscore(series, lookback):
     
     s = pd.Series(series, dtype="float64")
 
+    if NUMBA_AVAILABLE:
+        # single pass for mean, variance and the score
+        return pd.Series(_rolling_zscore(s.to_numpy(), lookback), index=s.index)
+
+    if bn is not None and lookback <= len(s):
+        x = s.to_numpy()
+        mean = bn.move_mean(x, lookback, min_count=lookback)
+        std = bn.move_std(x, lookback, min_count=lookback, ddof=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = (x - mean) / std
+        # a window of identical values has zero variance; don't divide by move_std's rounding residue
+        bars = np.arange(len(x))
+        run_start = np.maximum.accumulate(np.where(np.r_[True, x[1:] != x[:-1]], bars, 0))
+        z[bars - run_start + 1 >= lookback] = 0.0
+        z[~np.isfinite(z)] = 0.0
+        z[: lookback - 1] = np.nan
+        return pd.Series(z, index=s.index)
+
     mean = s.rolling(window=lookback, min_periods=lookback).mean()
     std = s.rolling(window=lookback, min_periods=lookback).std(ddof=0)
 
@@ -27,4 +58,4 @@ def zscore(series, lookback):
 
     z_score.iloc[: lookback - 1] = np.nan
 
-    return z_score
\ No newline at end of file
+    return z_score
@@ -0,0 +1,78 @@
+import numpy as np
+from ._njit import njit
+
+# No fastmath here: it would let LLVM reassociate away the Kahan compensation
+
+@njit(cache=True)
+def _rolling_mean(x, window):
+    n = len(x)
+    out = np.empty(n, dtype=np.float64)
+    total = 0.0
+    comp = 0.0  # Kahan compensation for the running sum
+    nobs = 0
+
+    for i in range(n):
+        if i >= window:
+            old = x[i - window]
+            if not np.isnan(old):
+                nobs -= 1
+                y = -old - comp
+                t = total + y
+                comp = (t - total) - y
+                total = t
+        val = x[i]
+        if not np.isnan(val):
+            nobs += 1
+            y = val - comp
+            t = total + y
+            comp = (t - total) - y
+            total = t
+
+        out[i] = total / window if nobs == window else np.nan
+
+    return out
+
+@njit(cache=True)
+def _rolling_zscore(x, window):
+    """Population z-score over a trailing window; 0.0 where it is undefined after warmup."""
+    n = len(x)
+    out = np.empty(n, dtype=np.float64)
+    mean = 0.0
+    ssqdm = 0.0  # sum of squared deviations from the mean (Welford)
+    nobs = 0
+    # add/remove updates leave rounding residue in ssqdm once a window goes flat;
+    # like pandas' roll_var, a run of identical values spanning the window means zero variance
+    prev_val = np.nan
+    same_run = 0
+
+    for i in range(n):
+        if i >= window:
+            old = x[i - window]
+            if not np.isnan(old):
+                nobs -= 1
+                if nobs > 0:
+                    delta = old - mean
+                    mean -= delta / nobs
+                    ssqdm -= ((nobs + 1) * delta * delta) / nobs
+                else:
+                    mean = 0.0
+                    ssqdm = 0.0
+        val = x[i]
+        if not np.isnan(val):
+            nobs += 1
+            delta = val - mean
+            mean += delta / nobs
+            ssqdm += ((nobs - 1) * delta * delta) / nobs
+            same_run = same_run + 1 if val == prev_val else 1
+        else:
+            same_run = 0
+        prev_val = val
+
+        if i < window - 1:
+            out[i] = np.nan
+        elif nobs == window and same_run < window and ssqdm > 0.0:
+            out[i] = (val - mean) / np.sqrt(ssqdm / nobs)
+        else:
+            out[i] = 0.0
+
+    return out
@@ -8,39 +8,44 @@ def equity_to_retruns(equity: pd.Series) -> pd.Series:
 
     return returns.dropna()
 
-def annualized_volume(returns: pd.Series) -> float:
-    if returns.empty:
-        return 0.0
-    
-    return float(returns.std(ddof=0) * np.sqrt(TRADING_DAYS_PER_YEAR))
+def _returns_array(returns: pd.Series) -> np.ndarray:
+    r = returns.to_numpy(dtype=float)
 
-def sharpe(returns:pd.Series, risk_free_daily: float = 0.0) -> float:
-    if returns.empty:
+    return r[~np.isnan(r)]
+
+def _sharpe_from_excess(excess_returns: np.ndarray) -> float:
+    if excess_returns.size == 0:
         return 0.0
-    excess_returns = returns - risk_free_daily
-    volume = excess_returns.std(ddof=0)
+    volume = excess_returns.std()
 
     if volume == 0 or np.isnan(volume):
         return 0.0
-    
-    mean = excess_returns.mean()
 
-    return float((mean * TRADING_DAYS_PER_YEAR)/ (volume * np.sqrt(TRADING_DAYS_PER_YEAR)))
+    return float((excess_returns.mean() * TRADING_DAYS_PER_YEAR)/ (volume * np.sqrt(TRADING_DAYS_PER_YEAR)))
 
-def sortino(returns: pd.Series, risk_free_daily: float = 0.0) -> float:
-    if returns.empty:
-        return 0.0
-    excess_returns = returns - risk_free_daily
+def _sortino_from_excess(excess_returns: np.ndarray) -> float:
     downside_returns = excess_returns[excess_returns < 0]
-    
-    downside_vol = downside_returns.std(ddof=0)
+    if downside_returns.size == 0:
+        return 0.0
+    downside_vol = downside_returns.std()
 
     if downside_vol == 0 or np.isnan(downside_vol):
         return 0.0
+
+    return float((excess_returns.mean() * TRADING_DAYS_PER_YEAR)/ (downside_vol * np.sqrt(TRADING_DAYS_PER_YEAR)))
+
+def annualized_volume(returns: pd.Series) -> float:
+    r = _returns_array(returns)
+    if r.size == 0:
+        return 0.0
     
-    mean = excess_returns.mean()
+    return float(r.std() * np.sqrt(TRADING_DAYS_PER_YEAR))
+
+def sharpe(returns:pd.Series, risk_free_daily: float = 0.0) -> float:
+    return _sharpe_from_excess(_returns_array(returns) - risk_free_daily)
 
-    return float((mean * TRADING_DAYS_PER_YEAR)/ (downside_vol * np.sqrt(TRADING_DAYS_PER_YEAR)))
+def sortino(returns: pd.Series, risk_free_daily: float = 0.0) -> float:
+    return _sortino_from_excess(_returns_array(returns) - risk_free_daily)
 
 
 def compound_annual_growth_rate(equity: pd.Series) -> float:
@@ -58,14 +63,31 @@ def compound_annual_growth_rate(equity: pd.Series) -> float:
 
     return float((end/start) ** (1/years) - 1) if years > 0 else 0.0
 
+def _drawdown(equity: np.ndarray) -> np.ndarray:
+    # fmax skips NaN like Series.cummax; the running-max buffer is reused for the result
+    drawdown = np.fmax.accumulate(equity)
+    # a zero running max gives NaN/inf quietly, as the pandas division did
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(equity, drawdown, out=drawdown)
+    drawdown -= 1.0
+
+    return drawdown
+
+def _longest_run(flags: np.ndarray) -> int:
+    # run-length encode the flags; +1/-1 steps mark run starts/ends
+    steps = np.diff(np.r_[0, flags.astype(np.int8), 0])
+    starts = np.flatnonzero(steps == 1)
+    ends = np.flatnonzero(steps == -1)
+
+    return int((ends - starts).max()) if len(starts) else 0
+
 def drawdown_series(equity: pd.Series) -> pd.Series:
     if equity.empty:
         return pd.Series(dtype=float)
     
-    rolling_max = equity.cummax()
-    drawdown = equity / rolling_max - 1.0
+    drawdown = _drawdown(equity.to_numpy(dtype=float))
 
-    return drawdown
+    return pd.Series(drawdown, index=equity.index, name=equity.name, copy=False)
 
 def max_drawdown(equity: pd.Series) -> float:
     drawdown = drawdown_series(equity)
@@ -77,21 +99,8 @@ def longest_drawdown_days(equity: pd.Series) -> int:
         return 0
     
     drawdown = drawdown_series(equity)
-    in_drawdown = drawdown < 0
-    longest = current = 0
-    prev = False
-
-    for flag in in_drawdown:
-        if flag:
-            current = current + 1 if prev else 1
-            prev = True
-        else:
-            longest = max(longest, current)
-            current = 0
-            prev = False
-    longest = max(longest, current)
-
-    return int(longest)
+
+    return _longest_run(drawdown.to_numpy() < 0)
 
 def extract_trades(bt: pd.DataFrame) -> pd.DataFrame:
     """
@@ -99,36 +108,30 @@ def extract_trades(bt: pd.DataFrame) -> pd.DataFrame:
     build a trade ledger: each BUY matched to the next SELL.
     Assumes long/flat (no shorts), all-in/all-out.
     """
-    trades = []
-    entry_price = None
-    entry_date = None
-    entry_shares = None
-
-    for dt, row in bt.iterrows():
-        ts = row.get("trade_shares", 0.0)
-        px = row.get("exec_px", np.nan)
-        if np.isnan(px) or ts == 0:
-            continue
-        if ts > 0 and entry_price is None:
-            # entry
-            entry_price = float(px)
-            entry_date = dt
-            entry_shares = float(ts)
-        elif ts < 0 and entry_price is not None:
-            # exit
-            exit_price = float(px)
-            exit_date = dt
-            shares = entry_shares  # positive
-            pnl = (exit_price - entry_price) * shares
-            ret = (exit_price / entry_price) - 1.0
-            trades.append({
-                "entry_date": entry_date, "entry_px": entry_price,
-                "exit_date": exit_date,   "exit_px": exit_price,
-                "shares": shares, "pnl": pnl, "return": ret
-            })
-            entry_price = entry_date = entry_shares = None
-
-    return pd.DataFrame(trades)
+    ts = bt["trade_shares"].to_numpy(dtype=float)
+    px = bt["exec_px"].to_numpy(dtype=float)
+
+    fills = np.flatnonzero(~np.isnan(px) & ~np.isnan(ts) & (ts != 0))
+    side = np.sign(ts[fills])
+    # a buy while already long or a sell while flat is ignored: keep side changes only,
+    # starting from the first buy, so entries and exits strictly alternate
+    changes = np.r_[True, side[1:] != side[:-1]] if len(side) else np.zeros(0, dtype=bool)
+    fills, side = fills[changes], side[changes]
+    if len(side) and side[0] < 0:
+        fills = fills[1:]
+
+    exits = fills[1::2]
+    entries = fills[0::2][:len(exits)]
+
+    entry_px = px[entries]
+    exit_px = px[exits]
+    shares = ts[entries]
+
+    return pd.DataFrame({
+        "entry_date": bt.index[entries], "entry_px": entry_px,
+        "exit_date": bt.index[exits],    "exit_px": exit_px,
+        "shares": shares, "pnl": (exit_px - entry_px) * shares, "return": exit_px / entry_px - 1.0
+    })
 
 def trade_stats(trades: pd.DataFrame) -> dict:
     if trades.empty:
@@ -149,16 +152,22 @@ def trade_stats(trades: pd.DataFrame) -> dict:
     }
 
 def summarize_backtest_performance(equity: pd.Series, rf_daily: float = 0.0) -> dict:
-    """One call to get all the metrics"""
-    returns = equity_to_retruns(equity)
+    """One call to get all the metrics, sharing returns and drawdown between them"""
+    eq = equity.to_numpy(dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = eq[1:] / eq[:-1] - 1.0
+    drawdown = _drawdown(eq)
+    returns = returns[~np.isnan(returns)]
+    excess_returns = returns - rf_daily
+    valid_drawdown = drawdown[~np.isnan(drawdown)]
 
     return {
-        "total_return": float(equity.iloc[-1] / equity.iloc[0] - 1.0) if len(equity) >= 2 else 0.0,
+        "total_return": float(eq[-1] / eq[0] - 1.0) if len(eq) >= 2 else 0.0,
         "CAGR": compound_annual_growth_rate(equity),
-        "vol_ann": annualized_volume(returns),
-        "sharpe": sharpe(returns, rf_daily),
-        "sortino": sortino(returns, rf_daily),
-        "max_drawdown": max_drawdown(equity),
-        "longest_drawdown_days": longest_drawdown_days(equity),
+        "vol_ann": float(returns.std() * np.sqrt(TRADING_DAYS_PER_YEAR)) if returns.size else 0.0,
+        "sharpe": _sharpe_from_excess(excess_returns),
+        "sortino": _sortino_from_excess(excess_returns),
+        "max_drawdown": float(valid_drawdown.min()) if valid_drawdown.size else 0.0,
+        "longest_drawdown_days": _longest_run(drawdown < 0),
     }
-    
\ No newline at end of file
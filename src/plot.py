@@ -1,3 +1,4 @@
+import numpy as np
 import matplotlib.pyplot as plt
 from src.metrics import drawdown_series
 
@@ -23,10 +24,13 @@ def plot_drawdown(equity, title="Drawdown"):
 def plot_signals(close, signal, title="Price + Signals"):
     plt.figure(figsize=(10,4))
     plt.plot(close.index, close.values, label="Close")
-    buy_dates = close.index[(signal.diff() > 0)]
-    sell_dates = close.index[(signal.diff() < 0)]
-    plt.scatter(buy_dates, close.loc[buy_dates], marker="^", color="green", label="Buy")
-    plt.scatter(sell_dates, close.loc[sell_dates], marker="v", color="red", label="Sell")
+    s = signal.to_numpy()
+    # integer transitions; the first bar is never a trade
+    transitions = np.diff(s, prepend=s[:1])
+    buy_idx = np.flatnonzero(transitions > 0)
+    sell_idx = np.flatnonzero(transitions < 0)
+    plt.scatter(close.index[buy_idx], close.values[buy_idx], marker="^", color="green", label="Buy")
+    plt.scatter(close.index[sell_idx], close.values[sell_idx], marker="v", color="red", label="Sell")
     plt.title(title)
     plt.legend()
     plt.show()
\ No newline at end of file
@@ -1,24 +1,37 @@
+import numpy as np
 import pandas as pd
 from .indicators import simple_moving_average, zscore
 
+def _hold_state(enter, leave, index) -> pd.Series:
+    """
+    Vectorized long/flat state machine: an enter-only bar goes long, a leave-only bar goes
+    flat, a bar flagging both flips the state and any other bar keeps it.
+    """
+    enter = np.asarray(enter, dtype=bool)
+    leave = np.asarray(leave, dtype=bool)
+    bars = np.arange(len(enter))
+
+    # the last enter-only/leave-only bar sets the state; every flip bar since toggles it
+    last_set = np.maximum.accumulate(np.where(enter ^ leave, bars, -1))
+    src = np.maximum(last_set, 0)
+    base = (last_set >= 0) & enter[src]
+    flips = np.cumsum(enter & leave)
+    flips_since = flips - np.where(last_set >= 0, flips[src], 0)
+
+    return pd.Series(base ^ (flips_since % 2 == 1), index=index).astype("int8")
+
 def signal_sma_crossover(close, fast, slow) -> pd.Series:
     fast_sma = simple_moving_average(close, fast)
     slow_sma = simple_moving_average(close, slow)
 
-    cross_above = (fast_sma > slow_sma) & (fast_sma.shift(1) <= slow_sma.shift(1))
-    cross_below = (fast_sma < slow_sma) & (fast_sma.shift(1) >= slow_sma.shift(1))
+    spread = (fast_sma - slow_sma).to_numpy()
+    prev_spread = np.r_[np.nan, spread[:-1]]
 
-    positions = []
-    current = 0
+    # NaN spreads compare False, so no cross is flagged during warmup
+    cross_above = (spread > 0) & (prev_spread <= 0)
+    cross_below = (spread < 0) & (prev_spread >= 0)
 
-    for up, down in zip(cross_above.fillna(False), cross_below.fillna(False)):
-        if up:
-            current = 1
-        elif down:
-            current = 0
-        positions.append(current)
-
-    signal = pd.Series(positions, index=close.index, dtype="int64")
+    signal = _hold_state(cross_above, cross_below, close.index)
 
     warmup = max(fast, slow) - 1
     signal.iloc[:warmup] = 0
@@ -26,25 +39,16 @@ def signal_sma_crossover(close, fast, slow) -> pd.Series:
     return signal
 
 def signal_mean_reversion(close, lookback, entry, exit) -> pd.Series:
-    z_score_output = zscore(close, lookback)
+    z_score_output = zscore(close, lookback).to_numpy()
     enter_long = z_score_output <= -entry
 
-    exit_flat = z_score_output.abs() <= exit
-
-    positions = []
-    current = 0
-
-    for enter, exit in zip(enter_long.fillna(False), exit_flat.fillna(False)):
-        if current == 0 and enter:
-            current = 1
-        elif current == 1 and exit:
-            current = 0
-        positions.append(current)
+    exit_flat = np.abs(z_score_output) <= exit
 
-    signal = pd.Series(positions, index=close.index, dtype="int64")
+    # bars meeting both thresholds (exit >= entry) flip the position, as the old loop did
+    signal = _hold_state(enter_long, exit_flat, close.index)
     signal.iloc[:lookback - 1] = 0
 
     return signal
 
 def align_next_bar(signal:pd.Series) -> pd.Series:
-    return signal.shift(1).fillna(0).astype("int64")
\ No newline at end of file
+    return signal.shift(1).fillna(0).astype("int8")
@@ -1,6 +1,29 @@
-import pandas as pd         
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+import src.data as data
 from src.data import get_price_data
 
+@pytest.fixture
+def fake_download(monkeypatch):
+    """Offline stand-in for yf.download; prices depend only on the date so overlapping fetches agree"""
+    calls = []
+
+    def download(tickers, start, end, **kwargs):
+        calls.append((list(tickers), start, end))
+        idx = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1))
+        idx = idx[~((idx.month == 1) & (idx.day == 1)) & ~((idx.month == 12) & (idx.day == 25))]
+        close = (idx - pd.Timestamp("2000-01-01")).days.to_numpy(dtype=float)
+        frames = {t: pd.DataFrame({"Open": close - 0.5, "Close": close}, index=idx) for t in tickers}
+        return pd.concat(frames, axis=1)
+
+    monkeypatch.setattr(data.yf, "download", download)
+    data._price_cache.clear()
+    yield calls
+    data._price_cache.clear()
+
 def test_get_price_data():
     # Use a date range that includes actual trading days (avoid holidays/weekends)
     df = get_price_data(["AAPL", "MSFT"], "2020-03-02", "2020-03-03")
@@ -8,4 +31,159 @@ def test_get_price_data():
     assert ("AAPL", "Close") in df.columns
     assert ("MSFT", "Close") in df.columns
     assert df.index.is_monotonic_increasing
-    assert df.index.tz is None
\ No newline at end of file
+    assert df.index.tz is None
+
+def test_cache_with_hole_is_not_covering(fake_download, tmp_path):
+    """Two separate fetches must not make the span between them look cached"""
+    get_price_data(["AAPL"], "2020-02-01", "2020-03-01", cache_dir=str(tmp_path))
+    data._price_cache.clear()
+    get_price_data(["AAPL"], "2021-02-01", "2021-03-01", cache_dir=str(tmp_path))
+    data._price_cache.clear()
+
+    df = get_price_data(["AAPL"], "2020-02-03", "2021-03-01", cache_dir=str(tmp_path))
+
+    assert len(fake_download) == 3
+    assert len(df) > 250
+    assert df.index.to_series().diff().max() <= pd.Timedelta(days=4)
+
+def test_holiday_bounds_are_served_from_cache(fake_download, tmp_path):
+    """A range starting or ending on a market holiday is cached after the first download"""
+    for _ in range(3):
+        data._price_cache.clear()
+        get_price_data(["AAPL"], "2020-01-01", "2020-12-26", cache_dir=str(tmp_path))
+
+    assert len(fake_download) == 1
+
+def test_sub_range_is_served_from_cache(fake_download, tmp_path):
+    full = get_price_data(["AAPL", "MSFT"], "2020-01-01", "2020-12-31", cache_dir=str(tmp_path))
+    data._price_cache.clear()
+
+    part = get_price_data(["AAPL", "MSFT"], "2020-03-01", "2020-06-30", cache_dir=str(tmp_path))
+
+    assert len(fake_download) == 1
+    expected = full.loc[(full.index >= "2020-03-01") & (full.index < "2020-06-30")]
+    assert np.array_equal(part.to_numpy(), expected.to_numpy())
+    assert part.index.max() == pd.Timestamp("2020-06-29")
+
+def test_end_date_is_exclusive_regardless_of_cache(fake_download, tmp_path):
+    """The same request returns the same rows whether freshly downloaded or cut from a wider cache"""
+    fresh = get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path / "fresh"))
+    get_price_data(["AAPL"], "2020-01-01", "2020-12-31", cache_dir=str(tmp_path / "wide"))
+    cached = get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path / "wide"))
+
+    assert len(fake_download) == 2
+    pd.testing.assert_frame_equal(fresh, cached, check_freq=False)
+
+def test_parquet_cache_round_trip(fake_download, tmp_path):
+    """Cache hits read typed Parquet back without re-parsing and match the downloaded frame"""
+    first = get_price_data(["AAPL"], "2020-01-01", "2020-06-30", cache_dir=str(tmp_path))
+    data._price_cache.clear()
+    second = get_price_data(["AAPL"], "2020-01-01", "2020-06-30", cache_dir=str(tmp_path))
+
+    assert (tmp_path / "AAPL.parquet").exists()
+    assert not list(tmp_path.glob("*.csv"))
+    assert len(fake_download) == 1
+    cached = pd.read_parquet(tmp_path / "AAPL.parquet")
+    assert isinstance(cached.index, pd.DatetimeIndex)
+    assert (cached.dtypes == "float64").all()
+    pd.testing.assert_frame_equal(first, second, check_freq=False)
+
+def test_memory_cache_returns_copies(fake_download, tmp_path):
+    first = get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path))
+    first.iloc[0, 0] = -1.0
+    second = get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path))
+
+    assert second.iloc[0, 0] != -1.0
+    assert len(fake_download) == 1
+
+def test_memory_cache_respects_ttl(fake_download, tmp_path):
+    """With cache_ttl set every call goes back to the disk cache, which is always stale at ttl=0"""
+    for _ in range(2):
+        get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path), cache_ttl=0.0)
+
+    assert len(fake_download) == 2
+
+def test_failed_download_is_not_memoized(fake_download, monkeypatch, tmp_path):
+    """yfinance signals failure with an empty frame; the next call must retry"""
+    working_download = data.yf.download
+    monkeypatch.setattr(data.yf, "download", lambda *args, **kwargs: pd.DataFrame())
+    failed = get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path))
+    assert failed.empty
+
+    monkeypatch.setattr(data.yf, "download", working_download)
+    retried = get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path))
+
+    assert not retried.empty
+    assert len(fake_download) == 1
+
+def test_columns_keyed_by_ticker_in_request_order(fake_download, tmp_path):
+    df = get_price_data(["MSFT", "AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path))
+
+    assert list(df.columns.names) == ["ticker", "field"]
+    assert list(df.columns) == [("MSFT", "Open"), ("MSFT", "Close"), ("AAPL", "Open"), ("AAPL", "Close")]
+    assert np.array_equal(df[("AAPL", "Close")].to_numpy(), df[("MSFT", "Close")].to_numpy())
+
+def test_unchanged_refresh_skips_rewrite(fake_download, monkeypatch, tmp_path):
+    """A TTL refresh that brings nothing new only touches the file; new rows trigger a write"""
+    writes = []
+    write_cache = data._write_cache
+    monkeypatch.setattr(data, "_write_cache", lambda df, path, ranges: (writes.append(path), write_cache(df, path, ranges)))
+
+    get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path))
+    get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path), cache_ttl=0.0)
+    assert len(fake_download) == 2
+    assert len(writes) == 1
+
+    get_price_data(["AAPL"], "2020-01-01", "2020-04-30", cache_dir=str(tmp_path), cache_ttl=0.0)
+    assert len(writes) == 2
+
+def test_nan_ticker_in_batch_keeps_cached_rows(fake_download, monkeypatch, tmp_path):
+    """A ticker failing inside a batch comes back as NaN columns; it must neither overwrite the cache nor count as fetched"""
+    get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path))
+    good = pd.read_parquet(tmp_path / "AAPL.parquet")
+
+    working_download = data.yf.download
+    def download(tickers, start, end, **kwargs):
+        df = working_download(tickers, start, end, **kwargs)
+        df["AAPL"] = np.nan
+        return df
+    monkeypatch.setattr(data.yf, "download", download)
+    data._price_cache.clear()
+    df = get_price_data(["AAPL", "MSFT"], "2020-01-01", "2020-06-30", cache_dir=str(tmp_path), cache_ttl=0.0)
+
+    assert df[("AAPL", "Close")].loc[:"2020-03-30"].notna().all()
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "AAPL.parquet"), good, check_freq=False)
+
+    monkeypatch.setattr(data.yf, "download", working_download)
+    data._price_cache.clear()
+    df = get_price_data(["AAPL", "MSFT"], "2020-01-01", "2020-06-30", cache_dir=str(tmp_path))
+
+    assert len(fake_download) == 3
+    assert df[("AAPL", "Close")].notna().all()
+
+def test_partial_cache_with_failed_download_is_not_memoized(fake_download, monkeypatch, tmp_path):
+    """Cached rows returned for a wider request whose download failed must not be pinned in memory"""
+    get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path))
+
+    working_download = data.yf.download
+    monkeypatch.setattr(data.yf, "download", lambda *args, **kwargs: pd.DataFrame())
+    partial = get_price_data(["AAPL"], "2020-01-01", "2020-12-31", cache_dir=str(tmp_path))
+    assert partial.index.max() < pd.Timestamp("2020-04-01")
+
+    monkeypatch.setattr(data.yf, "download", working_download)
+    retried = get_price_data(["AAPL"], "2020-01-01", "2020-12-31", cache_dir=str(tmp_path))
+
+    assert len(fake_download) == 2
+    assert retried.index.max() > pd.Timestamp("2020-12-01")
+
+def test_failed_refresh_keeps_cache_stale(fake_download, monkeypatch, tmp_path):
+    """A refresh that downloads nothing must not restart the TTL of the stale file"""
+    get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path))
+    cache_file = tmp_path / "AAPL.parquet"
+    stale = time.time() - 1000
+    os.utime(cache_file, (stale, stale))
+
+    monkeypatch.setattr(data.yf, "download", lambda *args, **kwargs: pd.DataFrame())
+    get_price_data(["AAPL"], "2020-01-01", "2020-03-31", cache_dir=str(tmp_path), cache_ttl=100)
+
+    assert os.path.getmtime(cache_file) == pytest.approx(stale, abs=1)
@@ -1,6 +1,9 @@
+import numpy as np
+import pandas as pd
 from src.data import get_price_data
 from src.strategies import signal_sma_crossover, align_next_bar
-from src.engine import run_backtest
+from src.engine import run_backtest, run_backtests
+from src.engine_kernel import _bt_kernel, _bt_vectorized
 
 def test_engine():
     """Test the backtesting engine with SMA crossover strategy"""
@@ -21,3 +24,35 @@ def test_engine():
     assert len(bt) > 0, "Backtest result should not be empty"
     assert "equity" in bt.columns, "Backtest should have equity column"
     assert bt["equity"].iloc[-1] > 0, "Final equity should be positive"
+
+
+def test_vectorized_matches_kernel():
+    """The NumPy fallback must reproduce the per-bar kernel on synthetic data"""
+    rng = np.random.default_rng(42)
+    n = 300
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    exec_px = np.r_[close[1:], np.nan]
+    exec_px[[50, 51, 120]] = np.nan  # gaps where transitions cannot execute
+    signal = (rng.random(n) < 0.5).astype(np.int8)
+
+    args = (close, exec_px, signal, 100_000.0, 1e-4, 1.0005, 0.9995)
+    expected_pos, expected = _bt_kernel(*args)
+    actual_pos, actual = _bt_vectorized(*args)
+    assert np.array_equal(expected_pos, actual_pos)
+    assert np.allclose(expected, actual, rtol=1e-9, atol=1e-6, equal_nan=True)
+
+
+def test_run_backtests_matches_sequential():
+    """Batch runs must return the same frames as one run_backtest call per ticker"""
+    rng = np.random.default_rng(3)
+    idx = pd.date_range("2022-01-03", periods=200, freq="B")
+    inputs = {}
+    for ticker in ["AAA", "BBB", "CCC"]:
+        close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(idx)))), index=idx)
+        inputs[ticker] = (close, pd.Series((rng.random(len(idx)) < 0.5).astype(int), index=idx))
+
+    results = run_backtests(inputs, max_workers=2, chunk_size=2, fee_bps=1)
+
+    assert list(results) == list(inputs)
+    for ticker, (close, signal) in inputs.items():
+        pd.testing.assert_frame_equal(results[ticker], run_backtest(close, signal, fee_bps=1))
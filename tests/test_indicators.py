@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+import src.indicators as indicators
+from src.indicators import simple_moving_average, zscore
+from src.indicators_kernel import _rolling_mean, _rolling_zscore
+
+def _baseline_series():
+    """Random walk with a NaN gap and a flat tail, to hit every branch of the fallback tiers"""
+    rng = np.random.default_rng(11)
+    s = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300))))
+    s.iloc[100:105] = np.nan
+    s.iloc[250:] = s.iloc[249]
+    return s
+
+def _baseline_zscore(s, lookback):
+    mean = s.rolling(window=lookback, min_periods=lookback).mean()
+    std = s.rolling(window=lookback, min_periods=lookback).std(ddof=0)
+    z = ((s - mean) / std).replace([np.inf, -np.inf], np.nan).fillna(0.0)
+    z.iloc[: lookback - 1] = np.nan
+    return z
+
+def test_rolling_kernels_match_pandas():
+    """Single-pass kernels must agree with pandas rolling mean/std"""
+    rng = np.random.default_rng(7)
+    s = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 500))))
+    s.iloc[100:105] = np.nan
+    window = 20
+
+    expected_mean = s.rolling(window=window, min_periods=window).mean()
+    assert np.allclose(_rolling_mean(s.to_numpy(), window), expected_mean, equal_nan=True)
+
+    mean = s.rolling(window=window, min_periods=window).mean()
+    std = s.rolling(window=window, min_periods=window).std(ddof=0)
+    expected_z = ((s - mean) / std).fillna(0.0)
+    expected_z.iloc[: window - 1] = np.nan
+    assert np.allclose(_rolling_zscore(s.to_numpy(), window), expected_z, equal_nan=True)
+
+def test_rolling_zscore_flat_tail_is_zero():
+    """Once the window is all one value the score is 0.0, not rounding residue blown up"""
+    x = np.r_[12.09477128948447, 32.02325147962692, np.full(60, 232.96915932164748)]
+    window = 8
+
+    z = _rolling_zscore(x, window)
+
+    assert np.array_equal(z[2 + window:], np.zeros(len(x) - 2 - window))
+
+@pytest.fixture(params=["bottleneck", "pandas"])
+def fallback_tier(request, monkeypatch):
+    """Run the indicators without numba, on bottleneck or on plain pandas"""
+    monkeypatch.setattr(indicators, "NUMBA_AVAILABLE", False)
+    if request.param == "bottleneck":
+        monkeypatch.setattr(indicators, "bn", pytest.importorskip("bottleneck"))
+    else:
+        monkeypatch.setattr(indicators, "bn", None)
+    return request.param
+
+@pytest.mark.parametrize("window", [1, 20, 400])
+def test_fallback_sma_matches_pandas(fallback_tier, window):
+    s = _baseline_series()
+
+    expected = s.rolling(window=window, min_periods=window).mean()
+    assert np.allclose(simple_moving_average(s, window), expected, equal_nan=True)
+
+@pytest.mark.parametrize("lookback", [1, 20, 400])
+def test_fallback_zscore_matches_pandas(fallback_tier, lookback):
+    s = _baseline_series()
+
+    z = zscore(s, lookback)
+
+    assert np.allclose(z, _baseline_zscore(s, lookback), equal_nan=True)
+    if lookback <= 50:
+        assert (z.iloc[250 + lookback:] == 0.0).all()
@@ -0,0 +1,50 @@
+import warnings
+import numpy as np
+import pandas as pd
+from src.metrics import (
+    equity_to_retruns, annualized_volume, sharpe, sortino,
+    drawdown_series, max_drawdown, longest_drawdown_days, summarize_backtest_performance, extract_trades,
+)
+
+def test_summary_matches_individual_metrics():
+    """The fused summary must agree with the standalone metric functions"""
+    rng = np.random.default_rng(11)
+    idx = pd.date_range("2022-01-03", periods=400, freq="B")
+    equity = pd.Series(100_000 * np.exp(np.cumsum(rng.normal(0, 0.01, len(idx)))), index=idx)
+    returns = equity_to_retruns(equity)
+
+    summary = summarize_backtest_performance(equity, rf_daily=1e-4)
+
+    assert np.isclose(summary["vol_ann"], annualized_volume(returns))
+    assert np.isclose(summary["sharpe"], sharpe(returns, 1e-4))
+    assert np.isclose(summary["sortino"], sortino(returns, 1e-4))
+    assert np.isclose(summary["max_drawdown"], max_drawdown(equity))
+    assert summary["longest_drawdown_days"] == longest_drawdown_days(equity)
+
+def test_drawdown_from_zero_equity_matches_pandas_without_warning():
+    """A zero running max divides quietly and gives the same NaNs as equity / cummax()"""
+    equity = pd.Series([0.0, 0.0, 10.0, 8.0, np.nan, 12.0])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        drawdown = drawdown_series(equity)
+
+    pd.testing.assert_series_equal(drawdown, equity / equity.cummax() - 1.0)
+
+def test_extract_trades_ignores_repeated_and_orphan_fills():
+    """Price gaps can leave a sell while flat or a buy while long; only alternating fills pair up"""
+    idx = pd.date_range("2022-01-03", periods=10, freq="B")
+    bt = pd.DataFrame({
+        "trade_shares": [-5.0, 10.0, 0.001, 0.0, -10.0, -3.0, 8.0, 5.0, -8.0, 4.0],
+        "exec_px":      [10.0, 11.0, 12.0, np.nan, 13.0, 14.0, 9.0, np.nan, 7.2, 7.0],
+    }, index=idx)
+
+    trades = extract_trades(bt)
+
+    assert list(trades["entry_date"]) == [idx[1], idx[6]]
+    assert list(trades["exit_date"]) == [idx[4], idx[8]]
+    assert np.allclose(trades["entry_px"], [11.0, 9.0])
+    assert np.allclose(trades["exit_px"], [13.0, 7.2])
+    assert np.allclose(trades["shares"], [10.0, 8.0])
+    assert np.allclose(trades["pnl"], [20.0, -14.4])
+    assert np.allclose(trades["return"], [13.0 / 11.0 - 1.0, 7.2 / 9.0 - 1.0])
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from src.indicators import simple_moving_average, zscore
+from src.strategies import signal_sma_crossover, signal_mean_reversion
+
+def _loop_sma_crossover(close, fast, slow):
+    """Reference per-bar implementation the vectorized strategy replaced"""
+    fast_sma = simple_moving_average(close, fast)
+    slow_sma = simple_moving_average(close, slow)
+    cross_above = (fast_sma > slow_sma) & (fast_sma.shift(1) <= slow_sma.shift(1))
+    cross_below = (fast_sma < slow_sma) & (fast_sma.shift(1) >= slow_sma.shift(1))
+
+    positions, current = [], 0
+    for up, down in zip(cross_above, cross_below):
+        if up:
+            current = 1
+        elif down:
+            current = 0
+        positions.append(current)
+
+    signal = pd.Series(positions, index=close.index)
+    signal.iloc[:max(fast, slow) - 1] = 0
+    return signal
+
+def _loop_mean_reversion(close, lookback, entry, exit):
+    """Reference per-bar implementation the vectorized strategy replaced"""
+    z_score_output = zscore(close, lookback)
+    enter_long = z_score_output <= -entry
+    exit_flat = z_score_output.abs() <= exit
+
+    positions, current = [], 0
+    for enter, leave in zip(enter_long, exit_flat):
+        if current == 0 and enter:
+            current = 1
+        elif current == 1 and leave:
+            current = 0
+        positions.append(current)
+
+    signal = pd.Series(positions, index=close.index)
+    signal.iloc[:lookback - 1] = 0
+    return signal
+
+def _random_close(rng, n=1000):
+    idx = pd.date_range("2020-01-01", periods=n, freq="B")
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, n))), index=idx)
+    close.iloc[300:310] = np.nan
+    close.iloc[500:540] = close.iloc[499]
+    return close
+
+def test_sma_crossover_matches_loop():
+    close = _random_close(np.random.default_rng(21))
+    for fast, slow in [(5, 20), (10, 30), (20, 50)]:
+        expected = _loop_sma_crossover(close, fast, slow)
+        assert np.array_equal(signal_sma_crossover(close, fast, slow).to_numpy(), expected.to_numpy())
+
+def test_mean_reversion_matches_loop():
+    """Includes exit >= entry, where a bar can meet both thresholds and the position flips"""
+    close = _random_close(np.random.default_rng(22))
+    for lookback, entry, exit in [(20, 1.0, 0.2), (20, 2.0, 0.5), (10, 0.5, 1.0), (15, 0.8, 0.8)]:
+        expected = _loop_mean_reversion(close, lookback, entry, exit)
+        assert np.array_equal(signal_mean_reversion(close, lookback, entry, exit).to_numpy(), expected.to_numpy())